@@ -1,12 +1,14 @@
 import sys
 import os
 import json
-import subprocess
+from functools import cache
+from itertools import chain
+from pathlib import Path
 from typing import Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields, replace
 
 # Stdin is the github context
-GITHUB_CONTEXT: dict = json.loads(sys.stdin.read())
+GITHUB_CONTEXT: dict = json.loads(sys.stdin.buffer.read())
 
 GITHUB_DEFAULT_RUNNER = "ubuntu-24.04"
 LINUX_X86_64 = "ubicloud-standard-8-ubuntu-2404"
@@ -16,22 +18,39 @@ WINDOWS_ARM = "windows-11-arm"
 MACOS_X86_64 = "macos-13"
 MACOS_ARM64 = "macos-15"
 
+BRAWL_PREFIXES: dict[Optional[str], str] = {
+    None: "refs/heads/automation/brawl/",
+    "merge": "refs/heads/automation/brawl/merge/",
+    "try": "refs/heads/automation/brawl/try/",
+}
 
-def is_brawl(mode: Optional[str] = None) -> bool:
-    if mode is None:
-        mode = ""
-    else:
-        mode = f"{mode}/"
+# (runner, display name, cache key suffix) for every platform we build on.
+TARGETS: tuple[tuple[str, str, str], ...] = (
+    (LINUX_X86_64, "Linux x86_64", "linux-x86_64"),
+    (LINUX_ARM64, "Linux arm64", "linux-arm64"),
+    (WINDOWS_X86_64, "Windows x86_64", "windows-x86_64"),
+    (WINDOWS_ARM, "Windows arm64", "windows-arm64"),
+    (MACOS_X86_64, "macOS x86_64", "macos-x86_64"),
+    (MACOS_ARM64, "macOS arm64", "macos-arm64"),
+)
+
+DOCS_SECRETS = ("CF_DOCS_API_KEY", "CF_DOCS_ACCOUNT_ID")
+CODECOV_SECRETS = ("CODECOV_TOKEN",)
 
+
+@cache
+def is_brawl(mode: Optional[str] = None) -> bool:
     return GITHUB_CONTEXT["event_name"] == "push" and GITHUB_CONTEXT["ref"].startswith(
-        f"refs/heads/automation/brawl/{mode}"
+        BRAWL_PREFIXES[mode]
     )
 
 
+@cache
 def is_pr() -> bool:
     return GITHUB_CONTEXT["event_name"] == "pull_request"
 
 
+@cache
 def is_fork_pr() -> bool:
     return (
         is_pr()
@@ -41,6 +60,7 @@ def is_fork_pr() -> bool:
         != "scufflecloud/scuffle".casefold()
     )
 
+@cache
 def is_dispatch_or_cron() -> bool:
     return GITHUB_CONTEXT["event_name"] in ["workflow_dispatch", "schedule"]
 
@@ -48,16 +68,55 @@ def pr_number() -> Optional[int]:
     if is_pr():
         return GITHUB_CONTEXT["event"]["number"]
     elif is_brawl("try"):
-        return int(GITHUB_CONTEXT["ref"].strip("refs/heads/automation/brawl/try/"))
+        return int(GITHUB_CONTEXT["ref"].removeprefix(BRAWL_PREFIXES["try"]))
 
     return None
 
 
+def head_sha() -> str:
+    git_dir = Path(".git")
+    head = (git_dir / "HEAD").read_text().strip()
+    if not head.startswith("ref: "):
+        return head
+
+    ref = head.removeprefix("ref: ")
+    loose_ref = git_dir / ref
+    if loose_ref.is_file():
+        return loose_ref.read_text().strip()
+
+    packed_refs = git_dir / "packed-refs"
+    if packed_refs.is_file():
+        for line in packed_refs.read_text().splitlines():
+            sha, _, name = line.partition(" ")
+            if name == ref:
+                return sha
+
+    raise RuntimeError(f"unable to resolve {ref}")
+
+
+# Try builds report the commit that is checked out rather than $SHA.
+COMMIT_SHA = head_sha() if is_brawl("try") else os.environ["SHA"]
+
+PR_NUMBER = pr_number()
+
+
+def is_full_run() -> bool:
+    # Only brawl and scheduled runs fan out to every platform.
+    return is_brawl() or is_dispatch_or_cron()
+
+
+def job_targets(full_run: bool) -> tuple[tuple[str, str, str], ...]:
+    if full_run:
+        return TARGETS
+
+    return TARGETS[:1]
+
+
 # The output should be in the form
 # matrix=<json>
 
 
-@dataclass
+@dataclass(slots=True, eq=False, repr=False)
 class RustSetup:
     toolchain: str
     shared_key: Optional[str]
@@ -66,67 +125,67 @@ class RustSetup:
     nightly_bypass: bool = False
 
 
-@dataclass
+@dataclass(slots=True, eq=False, repr=False)
 class FfmpegSetup:
     version: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True, eq=False, repr=False)
 class DocsRsMatrix:
     artifact_name: Optional[str]
     pr_number: Optional[int]
     deploy_docs: bool
 
 
-@dataclass
+@dataclass(slots=True, eq=False, repr=False)
 class DocusaurusMatrix:
     pr_number: Optional[int]
     deploy_docs: bool
 
 
-@dataclass
+@dataclass(slots=True, eq=False, repr=False)
 class ClippyMatrix:
     powerset: bool
 
 
-@dataclass
+@dataclass(slots=True, eq=False, repr=False)
 class TestMatrix:
     pr_number: Optional[int]
     commit_sha: str
     no_coverage: bool = False
 
 
-@dataclass
+@dataclass(slots=True, eq=False, repr=False)
 class GrindMatrix:
     env: str
 
 
-@dataclass
+@dataclass(slots=True, eq=False, repr=False)
 class FmtMatrix:
     pass
 
 
-@dataclass
+@dataclass(slots=True, eq=False, repr=False)
 class LockfileMatrix:
     pass
 
 
-@dataclass
+@dataclass(slots=True, eq=False, repr=False)
 class HakariMatrix:
     pass
 
 
-@dataclass
+@dataclass(slots=True, eq=False, repr=False)
 class ReadmeMatrix:
     pass
 
 
-@dataclass
+@dataclass(slots=True, eq=False, repr=False)
 class ReleaseChecksMatrix:
     pr_number: Optional[int]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True, eq=False, repr=False)
 class Job:
     runner: str
     job_name: str
@@ -146,147 +205,76 @@ class Job:
         | ReadmeMatrix
     )
     job: str
-    secrets: Optional[list[str]] = None
-
-
-def create_docsrs_jobs() -> list[Job]:
+    secrets: Optional[tuple[str, ...]] = None
+
+
+FFMPEG = FfmpegSetup()
+
+VALGRIND_RUNNER = "valgrind --error-exitcode=1 --leak-check=full --gen-suppressions=all --suppressions=$(pwd)/valgrind_suppressions.log"
+GRIND_ENV_X86_64 = json.dumps(
+    {"CARGO_TARGET_X86_64_UNKNOWN_LINUX_GNU_RUNNER": VALGRIND_RUNNER}
+)
+GRIND_ENV_ARM64 = json.dumps(
+    {"CARGO_TARGET_AARCH64_UNKNOWN_LINUX_GNU_RUNNER": VALGRIND_RUNNER}
+)
+
+# Toolchain setups shared by every target of a job, only the cache key varies.
+DOCS_RUST = RustSetup(
+    toolchain="stable",
+    components="rust-docs",
+    shared_key=None,
+    nightly_bypass=True,
+)
+CLIPPY_RUST = RustSetup(
+    toolchain="stable",
+    components="clippy",
+    shared_key=None,
+    tools="cargo-nextest,cargo-llvm-cov,cargo-hakari,just",
+)
+TEST_RUST = RustSetup(
+    toolchain="stable",
+    components="llvm-tools-preview",
+    shared_key=None,
+    tools="cargo-nextest,cargo-llvm-cov,cargo-hakari",
+    nightly_bypass=True,
+)
+TEST_NO_COVERAGE_RUST = RustSetup(
+    toolchain="stable",
+    shared_key=None,
+    tools="cargo-nextest,cargo-hakari",
+    nightly_bypass=True,
+)
+GRIND_RUST = RustSetup(
+    toolchain="stable",
+    shared_key=None,
+    tools="cargo-nextest,cargo-hakari",
+    nightly_bypass=True,
+)
+
+
+def create_docsrs_jobs(full_run: bool) -> list[Job]:
     jobs: list[Job] = []
 
     deploy_docs = not is_brawl("merge") and not is_fork_pr() and not is_dispatch_or_cron()
 
-    jobs.append(
-        Job(
-            runner=LINUX_X86_64,
-            job_name="Docs.rs (Linux x86_64)",
-            job="docsrs",
-            ffmpeg=FfmpegSetup(),
-            setup_protoc=True,
-            inputs=DocsRsMatrix(
-                artifact_name="docsrs",
-                deploy_docs=deploy_docs,
-                pr_number=pr_number(),
-            ),
-            rust=RustSetup(
-                toolchain="stable",
-                components="rust-docs",
-                shared_key="docs-linux-x86_64",
-                tools="",
-                nightly_bypass=True,
-            ),
-            secrets=(
-                ["CF_DOCS_API_KEY", "CF_DOCS_ACCOUNT_ID"] if deploy_docs else None
-            ),
-        )
-    )
-
-    if is_brawl() or is_dispatch_or_cron():
-        jobs.append(
-            Job(
-                runner=LINUX_ARM64,
-                job_name="Docs.rs (Linux arm64)",
-                job="docsrs",
-                ffmpeg=FfmpegSetup(),
-                setup_protoc=True,
-                inputs=DocsRsMatrix(
-                    artifact_name=None,
-                    deploy_docs=False,
-                    pr_number=pr_number(),
-                ),
-                rust=RustSetup(
-                    toolchain="stable",
-                    components="rust-docs",
-                    shared_key="docs-linux-arm64",
-                    tools="",
-                    nightly_bypass=True,
-                ),
-            )
-        )
+    for runner, name, key in job_targets(full_run):
+        # Only the primary target publishes its docs.
+        primary = runner == LINUX_X86_64
 
         jobs.append(
             Job(
-                runner=WINDOWS_X86_64,
-                job_name="Docs.rs (Windows x86_64)",
+                runner=runner,
+                job_name=f"Docs.rs ({name})",
                 job="docsrs",
-                ffmpeg=FfmpegSetup(),
+                ffmpeg=FFMPEG,
                 setup_protoc=True,
                 inputs=DocsRsMatrix(
-                    artifact_name=None,
-                    deploy_docs=False,
-                    pr_number=pr_number(),
-                ),
-                rust=RustSetup(
-                    toolchain="stable",
-                    components="rust-docs",
-                    shared_key="docs-windows-x86_64",
-                    tools="",
-                    nightly_bypass=True,
-                ),
-            )
-        )
-
-        jobs.append(
-            Job(
-                runner=WINDOWS_ARM,
-                job_name="Docs.rs (Windows arm64)",
-                job="docsrs",
-                ffmpeg=FfmpegSetup(),
-                setup_protoc=True,
-                inputs=DocsRsMatrix(
-                    artifact_name=None,
-                    deploy_docs=False,
-                    pr_number=pr_number(),
-                ),
-                rust=RustSetup(
-                    toolchain="stable",
-                    components="rust-docs",
-                    shared_key="docs-windows-arm64",
-                    tools="",
-                    nightly_bypass=True,
-                ),
-            )
-        )
-
-        jobs.append(
-            Job(
-                runner=MACOS_X86_64,
-                job_name="Docs.rs (macOS x86_64)",
-                job="docsrs",
-                ffmpeg=FfmpegSetup(),
-                setup_protoc=True,
-                inputs=DocsRsMatrix(
-                    artifact_name=None,
-                    deploy_docs=False,
-                    pr_number=pr_number(),
-                ),
-                rust=RustSetup(
-                    toolchain="stable",
-                    components="rust-docs",
-                    shared_key="docs-macos-x86_64",
-                    tools="",
-                    nightly_bypass=True,
-                ),
-            )
-        )
-
-        jobs.append(
-            Job(
-                runner=MACOS_ARM64,
-                job_name="Docs.rs (macOS arm64)",
-                job="docsrs",
-                ffmpeg=FfmpegSetup(),
-                setup_protoc=True,
-                inputs=DocsRsMatrix(
-                    artifact_name=None,
-                    deploy_docs=False,
-                    pr_number=pr_number(),
-                ),
-                rust=RustSetup(
-                    toolchain="stable",
-                    components="rust-docs",
-                    shared_key="docs-macos-arm64",
-                    tools="",
-                    nightly_bypass=True,
+                    artifact_name="docsrs" if primary else None,
+                    deploy_docs=primary and deploy_docs,
+                    pr_number=PR_NUMBER,
                 ),
+                rust=replace(DOCS_RUST, shared_key=f"docs-{key}"),
+                secrets=DOCS_SECRETS if primary and deploy_docs else None,
             )
         )
 
@@ -307,281 +295,61 @@ def create_docusaurus_jobs() -> list[Job]:
             setup_protoc=False,
             inputs=DocusaurusMatrix(
                 deploy_docs=deploy_docs,
-                pr_number=pr_number(),
+                pr_number=PR_NUMBER,
             ),
             rust=None,
-            secrets=(
-                ["CF_DOCS_API_KEY", "CF_DOCS_ACCOUNT_ID"] if deploy_docs else None
-            ),
+            secrets=DOCS_SECRETS if deploy_docs else None,
         )
     )
 
     return jobs
 
 
-def create_clippy_jobs() -> list[Job]:
+def create_clippy_jobs(full_run: bool) -> list[Job]:
     jobs: list[Job] = []
 
-    jobs.append(
-        Job(
-            runner=LINUX_X86_64,
-            job_name="Clippy (Linux x86_64)",
-            job="clippy",
-            ffmpeg=FfmpegSetup(),
-            setup_protoc=True,
-            inputs=ClippyMatrix(
-                powerset=is_brawl(),
-            ),
-            rust=RustSetup(
-                toolchain="stable",
-                components="clippy",
-                shared_key="clippy-linux-x86_64",
-                tools="cargo-nextest,cargo-llvm-cov,cargo-hakari,just",
-            ),
-        )
-    )
-
-    if is_brawl() or is_dispatch_or_cron():
-        jobs.append(
-            Job(
-                runner=LINUX_ARM64,
-                job_name="Clippy (Linux arm64)",
-                job="clippy",
-                ffmpeg=FfmpegSetup(),
-                setup_protoc=True,
-                inputs=ClippyMatrix(
-                    powerset=True,
-                ),
-                rust=RustSetup(
-                    toolchain="stable",
-                    components="clippy",
-                    shared_key="clippy-linux-arm64",
-                    tools="cargo-nextest,cargo-llvm-cov,cargo-hakari,just",
-                ),
-            )
-        )
-
+    for runner, name, key in job_targets(full_run):
         jobs.append(
             Job(
-                runner=WINDOWS_X86_64,
-                job_name="Clippy (Windows x86_64)",
+                runner=runner,
+                job_name=f"Clippy ({name})",
                 job="clippy",
-                ffmpeg=FfmpegSetup(),
+                ffmpeg=FFMPEG,
                 setup_protoc=True,
                 inputs=ClippyMatrix(
-                    powerset=True,
-                ),
-                rust=RustSetup(
-                    toolchain="stable",
-                    components="clippy",
-                    shared_key="clippy-windows-x86_64",
-                    tools="cargo-nextest,cargo-llvm-cov,cargo-hakari,just",
-                ),
-            )
-        )
-
-        jobs.append(
-            Job(
-                runner=WINDOWS_ARM,
-                job_name="Clippy (Windows arm64)",
-                job="clippy",
-                ffmpeg=FfmpegSetup(),
-                setup_protoc=True,
-                inputs=ClippyMatrix(
-                    powerset=True,
-                ),
-                rust=RustSetup(
-                    toolchain="stable",
-                    components="clippy",
-                    shared_key="clippy-windows-arm64",
-                    tools="cargo-nextest,cargo-llvm-cov,cargo-hakari,just",
-                ),
-            )
-        )
-
-        jobs.append(
-            Job(
-                runner=MACOS_X86_64,
-                job_name="Clippy (macOS x86_64)",
-                job="clippy",
-                ffmpeg=FfmpegSetup(),
-                setup_protoc=True,
-                inputs=ClippyMatrix(
-                    powerset=True,
-                ),
-                rust=RustSetup(
-                    toolchain="stable",
-                    components="clippy",
-                    shared_key="clippy-macos-x86_64",
-                    tools="cargo-nextest,cargo-llvm-cov,cargo-hakari,just",
-                ),
-            )
-        )
-
-        jobs.append(
-            Job(
-                runner=MACOS_ARM64,
-                job_name="Clippy (macOS arm64)",
-                job="clippy",
-                ffmpeg=FfmpegSetup(),
-                setup_protoc=True,
-                inputs=ClippyMatrix(
-                    powerset=True,
-                ),
-                rust=RustSetup(
-                    toolchain="stable",
-                    components="clippy",
-                    shared_key="clippy-macos-arm64",
-                    tools="cargo-nextest,cargo-llvm-cov,cargo-hakari,just",
+                    powerset=is_brawl() or runner != LINUX_X86_64,
                 ),
+                rust=replace(CLIPPY_RUST, shared_key=f"clippy-{key}"),
             )
         )
 
     return jobs
 
 
-def create_test_jobs() -> list[Job]:
+def create_test_jobs(full_run: bool) -> list[Job]:
     jobs: list[Job] = []
 
-    secrets = ["CODECOV_TOKEN"] if not is_fork_pr() else None
-
-    commit_sha = os.environ["SHA"]
-    if is_brawl("try"):
-        commit_sha = (
-            subprocess.check_output(["git", "log", "-n", "1", "--pretty=format:%H"])
-            .decode()
-            .strip()
-        )
-
-    jobs.append(
-        Job(
-            runner=LINUX_X86_64,
-            job_name="Test (Linux x86_64)",
-            job="test",
-            ffmpeg=FfmpegSetup(),
-            setup_protoc=True,
-            inputs=TestMatrix(
-                pr_number=pr_number(),
-                commit_sha=commit_sha,
-            ),
-            rust=RustSetup(
-                toolchain="stable",
-                components="llvm-tools-preview",
-                shared_key="test-linux-x86_64",
-                tools="cargo-nextest,cargo-llvm-cov,cargo-hakari",
-                nightly_bypass=True,
-            ),
-            secrets=secrets,
-        )
-    )
-
-    if is_brawl() or is_dispatch_or_cron():
-        jobs.append(
-            Job(
-                runner=LINUX_ARM64,
-                job_name="Test (Linux arm64)",
-                job="test",
-                ffmpeg=FfmpegSetup(),
-                setup_protoc=True,
-                inputs=TestMatrix(
-                    pr_number=pr_number(),
-                    commit_sha=commit_sha,
-                ),
-                rust=RustSetup(
-                    toolchain="stable",
-                    components="llvm-tools-preview",
-                    shared_key="test-linux-arm64",
-                    tools="cargo-nextest,cargo-llvm-cov,cargo-hakari",
-                    nightly_bypass=True,
-                ),
-                secrets=secrets,
-            )
-        )
-
-        jobs.append(
-            Job(
-                runner=WINDOWS_X86_64,
-                job_name="Test (Windows x86_64)",
-                job="test",
-                ffmpeg=FfmpegSetup(),
-                setup_protoc=True,
-                inputs=TestMatrix(
-                    pr_number=pr_number(),
-                    commit_sha=commit_sha,
-                ),
-                rust=RustSetup(
-                    toolchain="stable",
-                    components="llvm-tools-preview",
-                    shared_key="test-windows-x86_64",
-                    tools="cargo-nextest,cargo-llvm-cov,cargo-hakari",
-                    nightly_bypass=True,
-                ),
-                secrets=secrets,
-            )
-        )
-
-        jobs.append(
-            Job(
-                runner=WINDOWS_ARM,
-                job_name="Test (Windows arm64)",
-                job="test",
-                ffmpeg=FfmpegSetup(),
-                setup_protoc=True,
-                inputs=TestMatrix(
-                    pr_number=pr_number(),
-                    commit_sha=commit_sha,
-                    # currently coverage doesnt work on windows arm
-                    no_coverage=True,
-                ),
-                rust=RustSetup(
-                    toolchain="stable",
-                    shared_key="test-windows-arm64",
-                    tools="cargo-nextest,cargo-hakari",
-                    nightly_bypass=True,
-                ),
-                secrets=secrets,
-            )
-        )
+    secrets = CODECOV_SECRETS if not is_fork_pr() else None
 
-        jobs.append(
-            Job(
-                runner=MACOS_X86_64,
-                job_name="Test (macOS x86_64)",
-                job="test",
-                ffmpeg=FfmpegSetup(),
-                setup_protoc=True,
-                inputs=TestMatrix(
-                    pr_number=pr_number(),
-                    commit_sha=commit_sha,
-                ),
-                rust=RustSetup(
-                    toolchain="stable",
-                    components="llvm-tools-preview",
-                    shared_key="test-macos-x86_64",
-                    tools="cargo-nextest,cargo-llvm-cov,cargo-hakari",
-                    nightly_bypass=True,
-                ),
-                secrets=secrets,
-            )
-        )
+    for runner, name, key in job_targets(full_run):
+        # currently coverage doesnt work on windows arm
+        no_coverage = runner == WINDOWS_ARM
 
         jobs.append(
             Job(
-                runner=MACOS_ARM64,
-                job_name="Test (macOS arm64)",
+                runner=runner,
+                job_name=f"Test ({name})",
                 job="test",
-                ffmpeg=FfmpegSetup(),
+                ffmpeg=FFMPEG,
                 setup_protoc=True,
                 inputs=TestMatrix(
-                    pr_number=pr_number(),
-                    commit_sha=commit_sha,
+                    pr_number=PR_NUMBER,
+                    commit_sha=COMMIT_SHA,
+                    no_coverage=no_coverage,
                 ),
-                rust=RustSetup(
-                    toolchain="stable",
-                    components="llvm-tools-preview",
-                    shared_key="test-macos-arm64",
-                    tools="cargo-nextest,cargo-llvm-cov,cargo-hakari",
-                    nightly_bypass=True,
+                rust=replace(
+                    TEST_NO_COVERAGE_RUST if no_coverage else TEST_RUST,
+                    shared_key=f"test-{key}",
                 ),
                 secrets=secrets,
             )
@@ -590,55 +358,39 @@ def create_test_jobs() -> list[Job]:
     return jobs
 
 
-def create_grind_jobs() -> list[Job]:
+def create_grind_jobs(full_run: bool) -> list[Job]:
+    if not full_run:
+        return []
+
     jobs: list[Job] = []
 
-    if is_brawl() or is_dispatch_or_cron():
-        jobs.append(
-            Job(
-                runner=LINUX_X86_64,
-                job_name="Grind (Linux x86_64)",
-                job="grind",
-                ffmpeg=FfmpegSetup(),
-                setup_protoc=True,
-                inputs=GrindMatrix(
-                    env=json.dumps(
-                        {
-                            "CARGO_TARGET_X86_64_UNKNOWN_LINUX_GNU_RUNNER": "valgrind --error-exitcode=1 --leak-check=full --gen-suppressions=all --suppressions=$(pwd)/valgrind_suppressions.log",
-                        }
-                    ),
-                ),
-                rust=RustSetup(
-                    toolchain="stable",
-                    shared_key="grind-linux-x86_64",
-                    tools="cargo-nextest,cargo-hakari",
-                    nightly_bypass=True,
-                ),
-            )
+    jobs.append(
+        Job(
+            runner=LINUX_X86_64,
+            job_name="Grind (Linux x86_64)",
+            job="grind",
+            ffmpeg=FFMPEG,
+            setup_protoc=True,
+            inputs=GrindMatrix(
+                env=GRIND_ENV_X86_64,
+            ),
+            rust=replace(GRIND_RUST, shared_key="grind-linux-x86_64"),
         )
+    )
 
-        jobs.append(
-            Job(
-                runner=LINUX_ARM64,
-                job_name="Grind (Linux arm64)",
-                job="grind",
-                ffmpeg=FfmpegSetup(),
-                setup_protoc=True,
-                inputs=GrindMatrix(
-                    env=json.dumps(
-                        {
-                            "CARGO_TARGET_AARCH64_UNKNOWN_LINUX_GNU_RUNNER": "valgrind --error-exitcode=1 --leak-check=full --gen-suppressions=all --suppressions=$(pwd)/valgrind_suppressions.log",
-                        }
-                    ),
-                ),
-                rust=RustSetup(
-                    toolchain="stable",
-                    shared_key="grind-linux-arm64",
-                    tools="cargo-nextest,cargo-hakari",
-                    nightly_bypass=True,
-                ),
-            )
+    jobs.append(
+        Job(
+            runner=LINUX_ARM64,
+            job_name="Grind (Linux arm64)",
+            job="grind",
+            ffmpeg=FFMPEG,
+            setup_protoc=True,
+            inputs=GrindMatrix(
+                env=GRIND_ENV_ARM64,
+            ),
+            rust=replace(GRIND_RUST, shared_key="grind-linux-arm64"),
         )
+    )
 
     return jobs
 
@@ -718,9 +470,9 @@ def create_semver_checks_jobs() -> list[Job]:
             runner=LINUX_X86_64,
             job_name="Release-checks",
             job="release-checks",
-            ffmpeg=FfmpegSetup(),
+            ffmpeg=FFMPEG,
             setup_protoc=True,
-            inputs=ReleaseChecksMatrix(pr_number=pr_number()),
+            inputs=ReleaseChecksMatrix(pr_number=PR_NUMBER),
             rust=RustSetup(
                 toolchain="stable",
                 components="rust-docs",
@@ -741,7 +493,7 @@ def create_readme_jobs() -> list[Job]:
             runner=LINUX_X86_64,
             job_name="Sync Rdme",
             job="sync-rdme",
-            ffmpeg=FfmpegSetup(),
+            ffmpeg=FFMPEG,
             setup_protoc=True,
             inputs=ReadmeMatrix(),
             rust=RustSetup(
@@ -757,25 +509,42 @@ def create_readme_jobs() -> list[Job]:
     return jobs
 
 
+def encode_dataclass(obj: object) -> dict:
+    # Shallow dict of the fields; the json encoder walks nested values itself.
+    return {field.name: getattr(obj, field.name) for field in fields(obj)}
+
+
 def create_jobs() -> list[Job]:
-    jobs = (
-        create_docsrs_jobs()
-        + create_clippy_jobs()
-        + create_test_jobs()
-        + create_grind_jobs()
-        + create_fmt_jobs()
-        + create_lock_jobs()
-        + create_hakari_jobs()
-        + create_semver_checks_jobs()
-        + create_docusaurus_jobs()
-        + create_readme_jobs()
+    full_run = is_full_run()
+
+    jobs = list(
+        chain.from_iterable(
+            (
+                create_docsrs_jobs(full_run),
+                create_clippy_jobs(full_run),
+                create_test_jobs(full_run),
+                create_grind_jobs(full_run),
+                create_fmt_jobs(),
+                create_lock_jobs(),
+                create_hakari_jobs(),
+                create_semver_checks_jobs(),
+                create_docusaurus_jobs(),
+                create_readme_jobs(),
+            )
+        )
     )
 
     return jobs
 
 
 def main():
-    print(f"matrix={json.dumps([asdict(job) for job in create_jobs()])}")
+    matrix = json.dumps(
+        create_jobs(),
+        default=encode_dataclass,
+        check_circular=False,
+        separators=(",", ":"),
+    )
+    sys.stdout.write(f"matrix={matrix}\n")
 
 
 if __name__ == "__main__":
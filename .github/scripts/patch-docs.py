@@ -12,22 +12,24 @@ def parse_args():
 def main():
     args = parse_args()
 
-    with open("target/doc/index.html", "r") as f:
-        content = f.read()
-
     pr_code = ""
     if args.pr_number:
         pr_code = f'<br><a href="{args.repo_url}/pull/{args.pr_number}">Pull Request {args.pr_number}</a>'
 
     commit_code = f'<br><a href="{args.repo_url}/commit/{args.commit_hash}">Commit <code>{args.commit_hash[:7]}</code></a>'
 
-    content = content.replace(
-        '</nav><div class="sidebar-resizer"',
-        f'<div class="version">Deployed from{pr_code}{commit_code}</div></nav><div class="sidebar-resizer"',
-    )
+    with open("target/doc/index.html", "r+b") as f:
+        content = f.read()
+
+        # The banner goes in front of the sidebar resizer.
+        anchor = content.find(b'</nav><div class="sidebar-resizer"')
+        if anchor == -1:
+            return
 
-    with open("target/doc/index.html", "w") as f:
-        f.write(content)
+        # Inserting only grows the file, so no truncate() is needed.
+        banner = f'<div class="version">Deployed from{pr_code}{commit_code}</div>'
+        f.seek(anchor)
+        f.write(b"".join((banner.encode(), content[anchor:])))
 
 
 if __name__ == "__main__":